@@ -6,17 +6,33 @@ from .environment_creation import build_environment
 from . import utility
 from . import errors
 
-from . import source
-from . import sink
-from . import multimeter
-from . import daq
+from importlib import import_module
 
-from . import powermeter
-from . import oscilloscope
-from . import networkanalyzer
 
-from . import functiongenerator
-from . import temperaturecontroller
+# instrument sub-modules are imported on first access, importing the package
+# (or a single driver) does not load every driver
+_driver_modules = ('source',
+                   'sink',
+                   'multimeter',
+                   'daq',
+
+                   'powermeter',
+                   'oscilloscope',
+                   'networkanalyzer',
+
+                   'functiongenerator',
+                   'temperaturecontroller'
+                   )
+
+
+def __getattr__(name: str):
+    if name in _driver_modules:
+        return import_module(f'.{name}', __name__)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(set(globals()).union(_driver_modules))
 
 
 __all__ = ['Scpi_Instrument', 'get_devices_addresses', 'identify_devices',
@@ -1,18 +1,46 @@
 import pyvisa
 from pyvisa import VisaIOError
-from typing import List, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import partial, wraps
+import asyncio
+import threading
+import warnings
+import weakref
+import re
 
 
 # Globals
-rm = pyvisa.ResourceManager()
+_rm = None
+_rm_lock = threading.Lock()
 
 
 # Utility Functions
+def _get_rm() -> pyvisa.ResourceManager:
+    """
+    _get_rm()
+
+    Returns the ResourceManager shared by all instruments, creating it on the
+    first call. Creation is deferred as it can be slow on some VISA
+    installations. The VISA library used can be selected with the
+    PYVISA_LIBRARY environment variable (e.g. '@py' for pyvisa-py).
+    """
+
+    global _rm
+
+    with _rm_lock:
+        if _rm is None:
+            _rm = pyvisa.ResourceManager()
+    return _rm
+
+
 def get_devices_addresses() -> Tuple[str]:
     """
     returns a list of the addresses of peripherals connected to the computer
     """
-    return rm.list_resources()
+    return _get_rm().list_resources()
 
 
 def identify_devices(verbose: bool = False) -> List[Tuple[str]]:
@@ -23,10 +51,13 @@ def identify_devices(verbose: bool = False) -> List[Tuple[str]]:
     those with a valid response response. The IDN query is a IEEE 488.2 Common
     Command and should be supported by all SCPI compatible instruments.
 
+    Devices are queried concurrently, with the exception of devices sharing
+    the same GPIB controller which are queried one at a time.
+
     Args:
         verbose (bool, optional): if True device addresses and responses, or,
-            lack thereof are printed to stdout as they are queried. Defaults to
-            False.
+            lack thereof are printed to stdout once all devices have been
+            queried. Defaults to False.
 
     Returns:
         List[Tuple[str]]: A list of tuples containing address, IDN response
@@ -34,34 +65,233 @@ def identify_devices(verbose: bool = False) -> List[Tuple[str]]:
             valid response.
     """
 
+    addresses = _get_rm().list_resources()
+
+    # instruments sharing a GPIB controller are probed one at a time, all
+    # other instruments are probed concurrently
+    groups = {}
+    for address in addresses:
+        groups.setdefault(_bus_key(address), []).append(address)
+
+    responses = {}
+    if groups:
+        with ThreadPoolExecutor(max_workers=min(32, len(groups))) as pool:
+            for result in pool.map(_probe_addresses, groups.values()):
+                responses.update(result)
+
     scpi_devices = []
-    for address in rm.list_resources():
-        try:
-            device = Scpi_Instrument(address, open_timeout=100,
-                                     timeout=500)
-            scpi_devices.append((address, device.idn))
+    for address in addresses:
+        idn = responses.get(address)
+        if idn is not None:
+            scpi_devices.append((address, idn))
             if verbose:
                 print("address: {}\nresponse: {}\n".format(*scpi_devices[-1]))
+        elif verbose:
+            print(f"Invalid IDN query reponse from address {address}\n")
+
+    return scpi_devices
+
+
+def _bus_key(address: str) -> str:
+    """
+    _bus_key(address)
+
+    Returns the GPIB controller prefix (e.g. 'GPIB0::') of a GPIB address, for
+    any other address the address itself is returned. Devices that share a
+    key share a bus and should not be communicated with concurrently.
+
+    Args:
+        address (str): VISA resource address.
+
+    Returns:
+        str: bus key of the address.
+    """
+
+    bus = re.match(r'GPIB\d+::', address)
+    return bus.group() if bus else address
+
+
+def _probe_addresses(addresses: List[str]) -> Dict[str, Optional[str]]:
+    """
+    _probe_addresses(addresses)
+
+    Sequentially sends an IDN query to each of the given addresses.
+
+    Args:
+        addresses (List[str]): addresses of the devices to query.
+
+    Returns:
+        Dict[str, Optional[str]]: IDN response of each address, None if the
+            device did not respond with a valid response.
+    """
+
+    responses = {}
+    for address in addresses:
+        try:
+            # reuse an existing connection to the device if there is one,
+            # otherwise a temporary connection is closed once released
+            device = Scpi_Instrument._open_sessions.get(address)
+            if device is None:
+                device = Scpi_Instrument(address, open_timeout=100,
+                                         timeout=500)
+            responses[address] = device.idn
 
         except pyvisa.Error:
-            if verbose:
-                print(f"Invalid IDN query reponse from address {address}\n")
-        finally:
-            del(device)
+            responses[address] = None
 
-    return scpi_devices
+    return responses
+
+
+def _join_commands(commands: Iterable[str]) -> str:
+    """
+    _join_commands(commands)
+
+    Joins scpi commands into a single compound message. Every command after
+    the first is prefixed with a colon (common commands excluded) so that its
+    header is interpreted from the root of the command tree.
+
+    Args:
+        commands (Iterable[str]): scpi commands to join.
+
+    Returns:
+        str: compound scpi message.
+    """
+
+    commands = [cmd.strip() for cmd in commands]
+    joined = commands[:1]
+    for cmd in commands[1:]:
+        joined.append(cmd if cmd.startswith((':', '*')) else f':{cmd}')
+    return ';'.join(joined)
+
+
+def _init_once(init):
+    """
+    _init_once(init)
+
+    Wraps the __init__ method of Scpi_Instrument and its subclasses. When the
+    instance is a shared session that is already connected (see
+    Scpi_Instrument.__new__) the whole __init__ chain is skipped, so settings
+    and setup commands of the existing session are left unchanged. Keyword
+    arguements have no effect in this case, a warning is issued for any that
+    differ from the session (see _ignored_kwargs).
+    """
+
+    @wraps(init)
+    def __init__(self, address: str, *args, **kwargs) -> None:
+        with self._init_lock:
+            if hasattr(self, 'instrument'):  # shared, already connected
+                ignored = _ignored_kwargs(self, kwargs)
+                if ignored:
+                    warnings.warn(f'{address} is already connected, keyword '
+                                  f'arguements {ignored} are ignored',
+                                  stacklevel=2)
+                return None
+
+            outermost = not hasattr(self, '_session_kwargs')
+            if outermost:
+                self._session_kwargs = dict(kwargs)
+
+            try:
+                init(self, address, *args, **kwargs)
+            except BaseException:
+                if outermost:  # failed instances are not shared
+                    with Scpi_Instrument._sessions_lock:
+                        if Scpi_Instrument._open_sessions.get(address) is self:
+                            del Scpi_Instrument._open_sessions[address]
+                    del self._session_kwargs
+                raise
+
+    return __init__
+
+
+def _ignored_kwargs(instance, kwargs: dict) -> dict:
+    """
+    _ignored_kwargs(instance, kwargs)
+
+    Returns the items of 'kwargs' that differ from the shared session
+    'instance'. Connection settings are compared against the values in use by
+    the session, any other kwarg is only considered the same if it was passed
+    with the same value when the session was created.
+    """
+
+    settings = {'timeout': (instance.timeout, int),
+                'chunk_size': (instance.instrument.chunk_size, int),
+                'read_termination': (instance.instrument.read_termination,
+                                     str),
+                'write_termination': (instance.instrument.write_termination,
+                                      str),
+                'deferred': (instance.deferred, bool),
+                }
+    missing = object()
+
+    ignored = {}
+    for key, value in kwargs.items():
+        if key in settings:
+            current, convert = settings[key]
+            same = (convert(value) == current)
+        else:
+            same = (instance._session_kwargs.get(key, missing) == value)
+
+        if not same:
+            ignored[key] = value
+    return ignored
 
 
 class Scpi_Instrument():
 
+    # live instances by address, allows a connection to be shared rather than
+    # opening multiple sessions with the same device
+    _open_sessions = weakref.WeakValueDictionary()
+    _sessions_lock = threading.Lock()
+
+    def __new__(cls, address: str, *args, **kwargs):
+        with Scpi_Instrument._sessions_lock:
+            instance = Scpi_Instrument._open_sessions.get(address)
+
+            if type(instance) is not cls:
+                instance = super().__new__(cls)
+                instance._init_lock = threading.RLock()
+
+                if address not in Scpi_Instrument._open_sessions:
+                    Scpi_Instrument._open_sessions[address] = instance
+
+        return instance
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if '__init__' in cls.__dict__:
+            cls.__init__ = _init_once(cls.__dict__['__init__'])
+
+    @_init_once
     def __init__(self, address: str, **kwargs) -> None:
         self.address = address
         open_timeout = int(kwargs.get('open_timeout', 1000))
 
-        self.instrument = rm.open_resource(self.address,
-                                           open_timeout=open_timeout)
+        self.instrument = _get_rm().open_resource(
+            self.address, open_timeout=open_timeout)
         self.timeout = int(kwargs.get('timeout', 1000))  # ms
 
+        # larger read chunks reduce the number of low-level read calls
+        # needed for large responses (waveforms, traces, etc.)
+        chunk_size = int(kwargs.get('chunk_size', 1 << 20))
+        self.instrument.chunk_size = chunk_size
+
+        for termination in ('read_termination', 'write_termination'):
+            if termination in kwargs:
+                setattr(self.instrument, termination, kwargs[termination])
+
+        self._idn = None
+        self._clsname = type(self).__name__
+
+        # commands issued through _enqueue are held here while deferred, if
+        # deferred is set outside of batch() the caller must call flush
+        self.deferred = bool(kwargs.get('deferred', False))
+        self._outbox = OrderedDict()
+
+        # single worker thread used for asynchronous queries, created on
+        # first use
+        self._io_pool = None
+
     @property
     def idn(self) -> str:
         """
@@ -73,11 +303,17 @@ class Scpi_Instrument():
         sent to the instrument is one of the IEEE 488.2 Common Commands and
         should be supported by all SCPI compatible instruments.
 
+        The response is invariant for the lifetime of the connection, the
+        instrument is only queried on the first access and the result is
+        reused afterwards.
+
         Returns:
             str: uniquely identifies the instrument
         """
 
-        return self.instrument.query('*IDN?')
+        if self._idn is None:
+            self._idn = self.instrument.query('*IDN?')
+        return self._idn
 
     def cls(self, **kwargs) -> None:
         """
@@ -95,6 +331,7 @@ class Scpi_Instrument():
             None
         """
 
+        self.flush()
         self.instrument.write('*CLS', **kwargs)
 
     def rst(self, **kwargs) -> None:
@@ -108,8 +345,51 @@ class Scpi_Instrument():
         Commands and should be supported by all SCPI compatible instruments.
         """
 
+        self.flush()
         self.instrument.write('*RST', **kwargs)
 
+    def sync(self, **kwargs) -> None:
+        """
+        sync(**kwargs)
+
+        Wait-to-Continue Command
+
+        Prevents the instrument from executing any further commands or queries
+        until all pending operations are complete. The WAI command sent to the
+        instrument is one of the IEEE 488.2 Common Commands and should be
+        supported by all SCPI compatible instruments.
+        """
+
+        self.flush()
+        self.instrument.write('*WAI', **kwargs)
+
+    def wait_opc(self, timeout: Optional[int] = None) -> None:
+        """
+        wait_opc(timeout=None)
+
+        Operation Complete Query
+
+        Blocks until all pending operations on the instrument are complete.
+        The OPC query sent to the instrument is one of the IEEE 488.2 Common
+        Commands and should be supported by all SCPI compatible instruments.
+
+        Args:
+            timeout (int, optional): time to wait for the operations to
+                complete in ms. Defaults to the instrument timeout.
+        """
+
+        self.flush()
+        if timeout is None:
+            self.instrument.query('*OPC?')
+            return None
+
+        previous_timeout = self.timeout
+        self.timeout = timeout
+        try:
+            self.instrument.query('*OPC?')
+        finally:
+            self.timeout = previous_timeout
+
     @property
     def timeout(self) -> int:
         return self.instrument.timeout
@@ -121,8 +401,15 @@ class Scpi_Instrument():
     def __del__(self) -> None:
         try:
             # if connection has been estabilished terminate it
+            if getattr(self, '_io_pool', None) is not None:
+                self._io_pool.shutdown(wait=False)
             if hasattr(self, 'instrument'):
-                self.instrument.close()
+                try:
+                    # send any commands still held in deferred mode
+                    if getattr(self, '_outbox', None):
+                        self.flush()
+                finally:
+                    self.instrument.close()
         except VisaIOError:
             # if connection not connection has been estabilished (such as if an
             # error is throw in __init__) do nothing
@@ -152,15 +439,9 @@ class Scpi_Instrument():
                 same address and class name. Otherwise False.
         """
 
-        if not isinstance(obj, Scpi_Instrument):
-            return False
-
-        if not (self.__class__.__name__ == obj.__class__.__name__):
-            return False
-
-        if not (self.address == obj.address):
-            return False
-        return True
+        return (isinstance(obj, Scpi_Instrument)
+                and self.address == obj.address
+                and self._clsname == obj._clsname)
 
     def __ne__(self, obj) -> bool:
         """
@@ -190,6 +471,7 @@ class Scpi_Instrument():
                 device.
         """
 
+        self.flush()
         self.instrument.write(str(command_str), **kwargs)
 
     def query_raw_scpi(self, query_str: str, **kwargs) -> str:
@@ -206,6 +488,7 @@ class Scpi_Instrument():
 
         """
 
+        self.flush()
         return self.instrument.query(str(query_str), **kwargs)
 
     def read_raw_scpi(self, **kwargs) -> str:
@@ -218,8 +501,159 @@ class Scpi_Instrument():
         Only to be used for read.
         """
 
+        self.flush()
         return self.instrument.read(**kwargs)
 
+    def write_many(self, commands: Sequence[str], **kwargs) -> None:
+        """
+        write_many(commands, **kwargs)
+
+        Sends multiple scpi commands to the device as a single compound
+        message, rather than one transaction per command.
+
+        Args:
+            commands (Sequence[str]): scpi commands to be passed through to the
+                device, in the order they should be executed.
+        """
+
+        self.flush()
+        if commands:
+            self.instrument.write(_join_commands(map(str, commands)), **kwargs)
+
+    def query_many(self, queries: Sequence[str], **kwargs) -> List[str]:
+        """
+        query_many(queries, **kwargs)
+
+        Sends multiple scpi queries to the device as a single compound query,
+        returning the response to each query. Responses are separated on ';'
+        so this is not suitable for queries whose response contains ';'.
+
+        Args:
+            queries (Sequence[str]): scpi queries to be passed through to the
+                device.
+
+        Returns:
+            List[str]: response to each query, in the same order as 'queries'.
+        """
+
+        if not queries:
+            return []
+
+        self.flush()
+        response = self.instrument.query(_join_commands(map(str, queries)),
+                                         **kwargs)
+        return [resp.strip() for resp in response.split(';')]
+
+    async def query_async(self, query_str: str, **kwargs) -> str:
+        """
+        query_async(query_str, **kwargs)
+
+        Asynchronous version of query_raw_scpi. The query is run on a worker
+        thread dedicated to this instrument, so queries to the same instrument
+        are run in the order they were issued while queries to different
+        instruments can run concurrently.
+
+        Args:
+            query_str: string, scpi query to be passed through to the device.
+
+        Returns:
+            str: response from the device.
+        """
+
+        with self._init_lock:
+            if self._io_pool is None:
+                self._io_pool = ThreadPoolExecutor(max_workers=1)
+
+        # held commands are flushed here rather than on the worker thread, so
+        # the outbox is only accessed from the calling thread
+        self.flush()
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._io_pool,
+            partial(self.instrument.query, str(query_str), **kwargs))
+
+    def _enqueue(self, key: Optional[str], command: str) -> None:
+        """
+        _enqueue(key, command)
+
+        Writes 'command' to the device. If the instrument is in deferred mode
+        the command is instead held until the next call to flush; any
+        previously held command with the same key is discarded in favor of
+        the newer command.
+
+        Commands that are actions rather than settings (e.g. triggering) are
+        issued with a key of None. These are never discarded and commands held
+        before them are always sent before them.
+
+        Args:
+            key (str | None): identifies the setting modified by the command,
+                typically the command header (e.g. 'SOUR1:VOLT').
+            command (str): complete scpi command to send.
+        """
+
+        if not self.deferred:
+            self.instrument.write(command)
+            return None
+
+        if key is None:
+            # re-key the held commands so that later commands can't replace
+            # them and move past this one
+            self._outbox = OrderedDict((object(), cmd)
+                                       for cmd in self._outbox.values())
+            key = object()
+
+        self._outbox.pop(key, None)  # newest command moves to the back
+        self._outbox[key] = command
+
+    def flush(self) -> None:
+        """
+        flush()
+
+        Sends any commands held while in deferred mode to the device as a
+        single compound scpi message, in the order they were issued.
+
+        batch() calls this automatically when its context exits. If deferred
+        mode is enabled directly instead (the "deferred" kwarg or attribute),
+        flush must be called to send the held commands; any still held when
+        the instance is destroyed are sent before the connection is closed,
+        but this should not be relied on.
+        """
+
+        if self._outbox:
+            self.instrument.write(_join_commands(self._outbox.values()))
+            self._outbox.clear()
+
+    @contextmanager
+    def batch(self):
+        """
+        batch()
+
+        Context manager which places the instrument in deferred mode for the
+        duration of the context. Commands issued through _enqueue are
+        coalesced and sent as a single compound message when the context
+        exits.
+
+        Queries and raw scpi commands are not deferred, any held commands are
+        flushed before they are sent so that they are executed in the order
+        they were issued.
+
+        Example:
+            with fgen.batch():
+                for v in range(10):
+                    fgen.set_voltage(v)  # only the final value is sent
+                fgen.set_frequency(1e3)
+        """
+
+        previous_state = self.deferred
+        self.deferred = True
+        try:
+            yield self
+        finally:
+            self.deferred = previous_state
+            if not previous_state:
+                self.flush()
+
 
 if __name__ == "__main__":
     pass
@@ -1,4 +1,4 @@
-from pythonequipmentdrivers import (Scpi_Instrument, VisaIOError)
+from ..core import (Scpi_Instrument, VisaIOError)
 from time import sleep
 
 
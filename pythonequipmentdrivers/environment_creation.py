@@ -1,9 +1,37 @@
 from pathlib import Path
+import asyncio
 import json
 from pyvisa import VisaIOError
 from . import errors
 from importlib import import_module
-from typing import Union, Tuple
+from functools import lru_cache
+from inspect import getmembers
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, FrozenSet, List, Union, Tuple
+from .core import _bus_key
+
+try:  # faster json parser if available
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_loads(data: bytes):
+    """
+    _json_loads(data)
+
+    Parses the json document 'data', using orjson if it is installed. orjson
+    is stricter than the json module (e.g. it rejects a leading byte order
+    mark and NaN/Infinity), documents it rejects are parsed again with the
+    json module so that the files accepted don't depend on orjson.
+    """
+
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
 
 
 def read_configuration(config_info: Union[str, Path, dict]) -> dict:
@@ -29,7 +57,7 @@ def read_configuration(config_info: Union[str, Path, dict]) -> dict:
 
     # read equipment info from file
     with open(config_info, 'rb') as file:
-        configuration = json.load(file)
+        configuration = _json_loads(file.read())
     return configuration
 
 
@@ -37,8 +65,8 @@ def mask_resources(configuration: dict, resource_mask: set) -> dict:
     """
     mask_resources(configuration, resource_mask)
 
-    Removes resources from 'configuration' that are not present in
-    'resource_mask'.
+    Returns a copy of 'configuration' containing only the resources present
+    in 'resource_mask'.
 
     Args:
         configuration (dict): resource configuration information for the
@@ -51,10 +79,8 @@ def mask_resources(configuration: dict, resource_mask: set) -> dict:
             resource_mask removed.
     """
 
-    for resource in set(configuration).difference(resource_mask):
-        configuration.pop(resource)
-
-    return configuration
+    return {name: info for name, info in configuration.items()
+            if name in resource_mask}
 
 
 class Environment:
@@ -67,7 +93,56 @@ class Environment:
     into the build_environment
     """
 
-    pass
+    def query_all(self, queries: Dict[str, str]) -> Dict[str, str]:
+        """
+        query_all(queries)
+
+        Sends a query to multiple resources of the environment concurrently,
+        see query_all_async. Cannot be called from within a running event
+        loop, use query_all_async instead.
+
+        Args:
+            queries (Dict[str, str]): scpi query to send to each resource,
+                keyed by the resource's attribute name.
+
+        Returns:
+            Dict[str, str]: response of each resource, keyed by the resource's
+                attribute name.
+        """
+
+        return asyncio.run(self.query_all_async(queries))
+
+    async def query_all_async(self, queries: Dict[str, str]) -> Dict[str, str]:
+        """
+        query_all_async(queries)
+
+        Sends a query to multiple resources of the environment concurrently.
+        The total time taken is set by the slowest resource rather than the sum
+        of all resources. Resources sharing a GPIB bus are queried one at a
+        time.
+
+        Args:
+            queries (Dict[str, str]): scpi query to send to each resource,
+                keyed by the resource's attribute name.
+
+        Returns:
+            Dict[str, str]: response of each resource, keyed by the resource's
+                attribute name.
+        """
+
+        bus_locks = {}
+
+        async def query(name: str, query_str: str) -> str:
+            resource = getattr(self, name)
+            lock = bus_locks.setdefault(_bus_key(resource.address),
+                                        asyncio.Lock())
+            async with lock:
+                return await resource.query_async(query_str)
+
+        responses = await asyncio.gather(*(query(name, query_str)
+                                           for name, query_str
+                                           in queries.items()))
+        return dict(zip(queries, responses))
 
 
 # Update expected/assumed format of json file
@@ -187,34 +262,42 @@ def build_environment(configuration: Union[str, Path, dict],
     if object_mask:
         env_config = mask_resources(env_config, object_mask)
 
-        if env_config.keys() != object_mask:
-            missing = object_mask.difference(env_config.keys())
+        missing = object_mask - env_config.keys()
+        if missing:
             raise errors.EnvironmentSetupError("Required Equipment Missing",
                                                missing)
 
-    # build Environment instance
-    env = Environment()
+    # connect to the resources concurrently, resources sharing a GPIB bus are
+    # connected to sequentially
+    groups = {}
     for name, meta_info in env_config.items():
+        bus = _bus_key(str(meta_info.get('address', '')))
+        groups.setdefault(bus, []).append((name, meta_info))
+
+    outcomes = {}
+    if groups:
+        with ThreadPoolExecutor(max_workers=min(32, len(groups))) as pool:
+            futures = [pool.submit(connect_resources, group)
+                       for group in groups.values()]
+            for future in as_completed(futures):
+                outcomes.update(future.result())
+
+    # build Environment instance, initialization sequences are run here in
+    # the order of the configuration as they may depend on one another
+    env = Environment()
+    for name in env_config:
 
         try:
-            # get object to instantate from it's source module
-            Module = import_module(meta_info.pop('definition'))
-            Resource = getattr(Module, meta_info.pop('object'))
-
-            # special keyword for resource initialization, not passed as kwarg
-            init_sequence = meta_info.pop('init', [])
+            resource_instance, init_sequence = outcomes[name]
+            if isinstance(resource_instance, Exception):
+                raise resource_instance
 
-            # create instance of Resource called 'name', any remaining items in
-            # meta_info will be passed as kwargs
-            setattr(env, name, Resource(**meta_info))
+            setattr(env, name, resource_instance)
 
             if kwargs.get('verbose', True):
                 print(f'[CONNECTED] {name}')
 
             if kwargs.get('init', False) and (init_sequence):
-                # get the instance in question
-                resource_instance = getattr(env, name)
-
                 initiaize_device(resource_instance, init_sequence)
                 if kwargs.get('verbose', True):
                     print('\tInitialzed')
@@ -238,29 +321,83 @@ def build_environment(configuration: Union[str, Path, dict],
     return env
 
 
-def get_callable_methods(instance) -> Tuple:
+@lru_cache(maxsize=None)
+def _resolve(definition: str, object_name: str) -> type:
+    """
+    _resolve(definition, object_name)
+
+    Returns the object called 'object_name' from the module 'definition'.
+    Lookups are cached as the same definitions are typically used by many
+    resources.
+    """
+
+    return getattr(import_module(definition), object_name)
+
+
+def connect_resources(resources: List[Tuple[str, dict]]
+                      ) -> Dict[str, Tuple[Any, list]]:
+    """
+    connect_resources(resources)
+
+    Sequentially instantiates the resources described by 'resources' (see
+    build_environment for the format of the resource information). Errors
+    raised while connecting to a resource are returned in place of the
+    resource instance rather than raised, so that the remaining resources can
+    still be connected to. Initialization sequences are not run, they are
+    returned so that the caller can run them in order.
+
+    Args:
+        resources (List[Tuple[str, dict]]): name, meta information pairs of
+            the resources to connect to.
+
+    Returns:
+        Dict[str, Tuple[Any, list]]: the resource instance (or the error
+            raised) for each name, along with its initialization sequence.
+    """
+
+    outcomes = {}
+    for name, meta_info in resources:
+        try:
+            # get object to instantate from it's source module
+            Resource = _resolve(meta_info.pop('definition'),
+                                meta_info.pop('object'))
+
+            # special keyword for resource initialization, not passed as kwarg
+            init_sequence = meta_info.pop('init', [])
+
+            # create instance of Resource, any remaining items in meta_info
+            # will be passed as kwargs
+            outcomes[name] = (Resource(**meta_info), init_sequence)
+
+        except Exception as error:
+            outcomes[name] = (error, [])
+
+    return outcomes
+
+
+def get_callable_methods(instance) -> FrozenSet[str]:
     """
     get_callable_methods(instance)
 
-    Returns a tuple of all callable methods of an object or instance that
+    Returns a set of all callable methods of an object or instance that
     are not "dunder"/"magic"/"private" methods
 
+    Methods are looked up on the class rather than the instance so that
+    properties (some of which query the device) are not evaluated.
+
     Args:
         instance (object): object or instance of an object to get the
             callable methods of.
 
     Returns:
-        tuple: collection of callable methods.
+        frozenset: collection of callable methods.
     """
 
-    # get methods that are callable (will not include sub-classes)
-    methods = instance.__dir__()
-    cmds = filter(lambda method: (callable(getattr(instance, method))),
-                  methods)
+    cls = instance if isinstance(instance, type) else type(instance)
 
-    # filter out ignore dunders
-    cmds = filter(lambda func_name: ('__' not in func_name), cmds)
-    return tuple(cmds)
+    # get methods that are callable, ignoring dunders
+    return frozenset(name for name, _ in getmembers(cls, predicate=callable)
+                     if '__' not in name)
 
 
 def initiaize_device(instance, sequence) -> None:
@@ -1,5 +1,5 @@
 from typing import Sequence
-from pythonequipmentdrivers import Scpi_Instrument
+from ..core import Scpi_Instrument
 import numpy as np
 
 
@@ -19,6 +19,56 @@ class Keysight_33500B(Scpi_Instrument):
     valid_wave_types = ('ARB', 'DC', 'NOIS', 'PRBS', 'PULSE', 'RAMP', 'SIN',
                         'SQU', 'TRI')
 
+    # parameter name: (command header template, response parser)
+    _CMDS = {'voltage': ('SOUR{source}:VOLT', float),
+             'voltage_offset': ('SOUR{source}:VOLT:OFFS', float),
+             'voltage_high': ('SOUR{source}:VOLT:HIGH', float),
+             'voltage_low': ('SOUR{source}:VOLT:LOW', float),
+             'frequency': ('SOUR{source}:FREQ', float),
+             'wave_type': ('SOUR{source}:FUNC', str.lower),
+             'pulse_dc': ('SOUR{source}:FUNC:PULSE:DCYC', float),
+             'pulse_width': ('SOUR{source}:FUNC:PULSE:WIDT', float),
+             'pulse_period': ('SOUR{source}:FUNC:PULSE:PER', float),
+             'pulse_hold': ('SOUR{source}:FUNC:PULSE:HOLD', str.lower),
+             'square_dc': ('SOUR{source}:FUNC:SQU:DCYC', float),
+             'square_period': ('SOUR{source}:FUNC:SQU:PER', float),
+             'burst_mode': ('SOUR{source}:BURS:MODE', str.lower),
+             'burst_gate_polarity': ('SOUR{source}:BURS:GATE:POL', str.lower),
+             'burst_phase': ('SOUR{source}:BURS:PHASE', float),
+             'trigger_delay': ('TRIG{source}:DEL', float),
+             'trigger_source': ('TRIG{source}:SOUR', str.lower),
+             'output_impedance': ('OUTP{source}:LOAD', float),
+             }
+
+    def __init__(self, address: str, **kwargs) -> None:
+        # responses are terminated with a newline, letting pyvisa strip it
+        # removes the need to clean up each response
+        kwargs.setdefault('read_termination', '\n')
+        kwargs.setdefault('write_termination', '\n')
+        super().__init__(address, **kwargs)
+
+    def _set(self, key: str, value, source: int = 1) -> None:
+        """
+        _set(key, value, source=1)
+
+        Sets the parameter 'key' (see _CMDS) of the given source to 'value'.
+        """
+
+        header = self._CMDS[key][0].format(source=source)
+        self._enqueue(header, f'{header} {value}')
+
+    def _get(self, key: str, source: int = 1):
+        """
+        _get(key, source=1)
+
+        Queries the parameter 'key' (see _CMDS) of the given source, the
+        response is parsed to the type listed in _CMDS.
+        """
+
+        template, parser = self._CMDS[key]
+        response = self.query_raw_scpi(f'{template.format(source=source)}?')
+        return parser(response)
+
     def set_waveform_config(self, source: int = 1, **kwargs) -> None:
         """
         set_waveform_config(self, source, **kwargs)
@@ -37,24 +87,41 @@ class Keysight_33500B(Scpi_Instrument):
             offset (float, optional): DC offset voltage of the waveform in
                 Volts DC.
             source (int, optional): Channel to configure (1,2). Defaults to 1.
+            sync (bool, optional): If True the instrument will wait for the
+                configuration to complete before executing any subsequent
+                commands (*WAI). Defaults to False.
 
         """
 
-        wave_type = kwargs.get('wave_type', self.get_wave_type(source))
-        frequency = kwargs.get('frequency', self.get_frequency(source))
-        amplitude = kwargs.get('amplitude', self.get_voltage(source))
-        offset = kwargs.get('offset', self.get_voltage_offset(source))
+        # fill in any omitted parameters with the current instrument settings,
+        # the missing values are fetched using a single compound query
+        params = {'wave_type': 'wave_type', 'frequency': 'frequency',
+                  'amplitude': 'voltage', 'offset': 'voltage_offset'}
+
+        missing = [arg for arg in params if arg not in kwargs]
+        if missing:
+            response = self.query_many(
+                [self._CMDS[params[arg]][0].format(source=source) + '?'
+                 for arg in missing])
+
+            for arg, value in zip(missing, response):
+                kwargs[arg] = self._CMDS[params[arg]][1](value)
 
-        self.instrument.write('SOUR{}:APPL:{} {}, {}, {}'.format(source,
-                                                                 wave_type,
-                                                                 frequency,
-                                                                 amplitude,
-                                                                 offset))
+        wave_type = kwargs['wave_type']
+        frequency = kwargs['frequency']
+        amplitude = kwargs['amplitude']
+        offset = kwargs['offset']
+
+        cmd = 'SOUR{}:APPL:{} {}, {}, {}'.format(source, wave_type, frequency,
+                                                 amplitude, offset)
+        if kwargs.get('sync', False):
+            cmd += ';*WAI'
+        self._enqueue(f'SOUR{source}:APPL', cmd)
 
     def get_waveform_config(self, source: int = 1):
-        response = self.instrument.query(f'SOUR{source}:APPL?')
+        response = self.query_raw_scpi(f'SOUR{source}:APPL?')
 
-        response = response.strip().replace('"', '')
+        response = response.replace('"', '')
 
         wave_type, wave_info = response.split()
 
@@ -63,290 +130,275 @@ class Keysight_33500B(Scpi_Instrument):
         return (wave_type, freq, amp, off)
 
     def set_voltage(self, voltage: float, source: int = 1):
-        self.instrument.write(f'SOUR{source}:VOLT {voltage}')
+        self._set('voltage', voltage, source)
         return None
 
     def get_voltage(self, source: int = 1):
-        response = self.instrument.query(f'SOUR{source}:VOLT?')
-        return float(response)
+        return self._get('voltage', source)
 
     def set_voltage_offset(self, voltage: float, source: int = 1):
-        self.instrument.write(f'SOUR{source}:VOLT:OFFS {voltage}')
+        self._set('voltage_offset', voltage, source)
         return None
 
     def get_voltage_offset(self, source: int = 1):
-        response = self.instrument.query(f'SOUR{source}:VOLT:OFFS?')
-        return float(response)
+        return self._get('voltage_offset', source)
 
     def set_voltage_high(self, voltage: float, source: int = 1):
-        self.instrument.write(f'SOUR{source}:VOLT:HIGH {voltage}')
+        self._set('voltage_high', voltage, source)
         return None
 
     def get_voltage_high(self, source: int = 1):
-        response = self.instrument.query(f'SOUR{source}:VOLT:HIGH?')
-        return float(response)
+        return self._get('voltage_high', source)
 
     def set_voltage_low(self, voltage: float, source: int = 1):
-        self.instrument.write(f'SOUR{source}:VOLT:LOW {voltage}')
+        self._set('voltage_low', voltage, source)
         return None
 
     def get_voltage_low(self, source: int = 1):
-        response = self.instrument.query(f'SOUR{source}:VOLT:LOW?')
-        return float(response)
+        return self._get('voltage_low', source)
 
     def set_frequency(self, frequency: float, source: int = 1):
-        self.instrument.write(f'SOUR{source}:FREQ {frequency}')
+        self._set('frequency', frequency, source)
         return None
 
     def get_frequency(self, source: int = 1):
-        response = self.instrument.query(f'SOUR{source}:FREQ?')
-        return float(response)
+        return self._get('frequency', source)
 
     def set_wave_type(self, wave_type: str, source: int = 1):
-        self.instrument.write(f'SOUR{source}:FUNC {wave_type}')
+        self._set('wave_type', wave_type, source)
         return None
 
     def get_wave_type(self, source: int = 1):
-        response = self.instrument.query(f'SOUR{source}:FUNC?')
-        return response.strip().lower()
+        return self._get('wave_type', source)
 
     def set_pulse_dc(self, duty_cycle, source: int = 1) -> None:
         dc = round(duty_cycle, 2)
-        self.instrument.write(f'SOUR{source}:FUNC:PULSE:DCYC {dc}')
+        self._set('pulse_dc', dc, source)
 
     def get_pulse_dc(self, source: int = 1):
-        response = self.instrument.query(f'SOUR{source}:FUNC:PULSE:DCYC?')
-        return float(response)
+        return self._get('pulse_dc', source)
 
     def set_pulse_width(self, width, source: int = 1):
-        self.instrument.write(f'SOUR{source}:FUNC:PULSE:WIDT {width}')
+        self._set('pulse_width', width, source)
         return None
 
     def get_pulse_width(self, source: int = 1):
-        response = self.instrument.query(f'SOUR{source}:FUNC:PULSE:WIDT?')
-        return float(response)
+        return self._get('pulse_width', source)
 
     def set_pulse_period(self, period, source: int = 1):
-        self.instrument.write(f'SOUR{source}:FUNC:PULSE:PER {period}')
+        self._set('pulse_period', period, source)
         return None
 
     def get_pulse_period(self, source: int = 1):
-        response = self.instrument.query(f'SOUR{source}:FUNC:PULSE:PER?')
-        return float(response)
+        return self._get('pulse_period', source)
 
     def set_pulse_edge_time(self, time, which: str = 'both', source: int = 1):
+        header = f'SOUR{source}:FUNC:PULSE:TRAN'
         which = which.upper()
-        if which == 'BOTH':
-            self.instrument.write(f'SOUR{source}:FUNC:PULSE:TRAN {time}')
-        elif which in ['RISE', 'RISING', 'R', 'LEAD', 'LEADING']:
-            self.instrument.write(f'SOUR{source}:FUNC:PULSE:TRAN:LEAD {time}')
+        if which in ['RISE', 'RISING', 'R', 'LEAD', 'LEADING']:
+            header += ':LEAD'
         elif which in ['FALL', 'FALLING', 'F', 'TRAIL', 'TRAILING']:
-            self.instrument.write(f'SOUR{source}:FUNC:PULSE:TRAN:TRA {time}')
+            header += ':TRA'
+        elif which != 'BOTH':
+            return None
+        self._enqueue(header, f'{header} {time}')
         return None
 
     def get_pulse_edge_time(self, which: str = 'both', source: int = 1):
         cmd_str = f'SOUR{source}:FUNC:PULSE:TRAN'
         which = which.upper()
         if which == 'BOTH':
-            response = [self.instrument.query(cmd_str + 'LEAD?'),
-                        self.instrument.query(cmd_str + 'TRA?')]
+            self.flush()
+            response = self.instrument.query_ascii_values(
+                f'{cmd_str}:LEAD?;:{cmd_str}:TRA?', separator=';')
+            return tuple(response)
         elif which in ['RISE', 'RISING', 'R', 'LEAD', 'LEADING']:
-            response = self.instrument.query(cmd_str + 'LEAD?')
+            response = self.query_raw_scpi(f'{cmd_str}:LEAD?')
         elif which in ['FALL', 'FALLING', 'F', 'TRAIL', 'TRAILING']:
-            response = self.instrument.query(cmd_str + 'TRA?')
+            response = self.query_raw_scpi(f'{cmd_str}:TRA?')
         else:
             raise ValueError('Invalid option for "which" arg')
-        if isinstance(response, list):
-            return tuple(map(float, response))
-        else:
-            return float(response)
+        return float(response)
 
     def set_pulse_hold(self, param: str, source: int = 1):
         param = param.upper()
         if param not in ['DCYC', 'WIDT']:
             raise ValueError(f"Invalid param {param}, must by 'DCYC'/'WIDT'")
-        self.instrument.write(f'SOUR{source}:FUNC:PULSE:HOLD {param}')
+        self._set('pulse_hold', param, source)
         return None
 
     def get_pulse_hold(self, source: int = 1):
-        response = self.instrument.query(f'SOUR{source}:FUNC:PULSE:HOLD?')
-        return response.strip().lower()
+        return self._get('pulse_hold', source)
 
     def set_square_dc(self, duty_cycle, source: int = 1):
-        self.instrument.write(f'SOUR{source}:FUNC:SQU:DCYC {duty_cycle}')
+        self._set('square_dc', duty_cycle, source)
         return None
 
     def get_square_dc(self, source: int = 1):
-        response = self.instrument.query(f'SOUR{source}:FUNC:SQU:DCYC?')
-        return float(response)
+        return self._get('square_dc', source)
 
     def set_square_period(self, period, source: int = 1):
-        self.instrument.write(f'SOUR{source}:FUNC:SQU:PER {period}')
+        self._set('square_period', period, source)
         return None
 
     def get_square_period(self, source: int = 1):
-        response = self.instrument.query(f'SOUR{source}:FUNC:SQU:PER?')
-        return float(response)
+        return self._get('square_period', source)
 
     def set_burst_mode(self, mode: str, source: int = 1) -> None:
         mode = mode.upper()
         burst_modes = ('TRIG', 'GAT')
         if mode not in burst_modes:
             raise ValueError(f'Invalid mode, valid modes are: {burst_modes}')
-        self.instrument.write(f'SOUR{source}:BURS:MODE {mode}')
+        self._set('burst_mode', mode, source)
 
     def get_burst_mode(self, source: int = 1) -> str:
-        response = self.instrument.query(f'SOUR{source}:BURS:MODE?')
-        return response.strip().lower()
+        return self._get('burst_mode', source)
 
     def set_burst_gate_polarity(self, polarity: str, source: int = 1):
         polarity = polarity.upper()
         if polarity not in ['NORM', 'INV']:
             raise ValueError('Invalid mode, valid modes are "NORM"/"INV"')
-        self.instrument.write(f'SOUR{source}:BURS:GATE:POL {polarity}')
+        self._set('burst_gate_polarity', polarity, source)
         return None
 
     def get_burst_gate_polarity(self, source: int = 1):
-        response = self.instrument.query(f'SOUR{source}:BURS:GATE:POL?')
-        return response.strip().lower()
+        return self._get('burst_gate_polarity', source)
 
     def set_burst_ncycles(self, ncycles: int, source: int = 1):
         str_options = ['INF', 'MIN', 'MAX']
+        header = f'SOUR{source}:BURS:NCYC'
         if isinstance(ncycles, int):
-            self.instrument.write(f'SOUR{source}:BURS:NCYC {ncycles}')
+            self._enqueue(header, f'{header} {ncycles}')
         elif isinstance(ncycles, str) and (ncycles.upper() in str_options):
-            self.instrument.write(f'SOUR{source}:BURS:NCYC {ncycles.upper()}')
+            self._enqueue(header, f'{header} {ncycles.upper()}')
         else:
             raise ValueError('invalid entry for ncycles')
         return None
 
     def get_burst_ncycles(self, source: int = 1):
-        response = self.instrument.query(f'SOUR{source}:BURS:NCYC?')
+        response = self.query_raw_scpi(f'SOUR{source}:BURS:NCYC?')
         return int(float(response))
 
     def set_burst_phase(self, phase: float, source: int = 1):
         str_options = ['MIN', 'MAX']
         if isinstance(phase, (float, int)):
-            self.instrument.write(f'SOUR{source}:BURS:PHASE {phase}')
+            self._set('burst_phase', phase, source)
         elif isinstance(phase, str) and (phase.upper() in str_options):
-            self.instrument.write(f'SOUR{source}:BURS:PHASE {phase.upper()}')
+            self._set('burst_phase', phase.upper(), source)
         else:
             raise ValueError('invalid entry for phase')
         return None
 
     def get_burst_phase(self, source: int = 1):
-        response = self.instrument.query(f'SOUR{source}:BURS:PHASE?')
-        return float(response)
+        return self._get('burst_phase', source)
 
     def set_burst_state(self, state: bool, source: int = 1) -> None:
-        self.instrument.write('SOUR{}:BURS:STAT {}'.format(int(source),
-                                                           1 if state else 0))
+        header = f'SOUR{int(source)}:BURS:STAT'
+        self._enqueue(header, f'{header} {1 if state else 0}')
 
     def get_burst_state(self, source: int = 1) -> bool:
-        response = self.instrument.query(f'SOUR{int(source)}:BURS:STAT?')
+        response = self.query_raw_scpi(f'SOUR{int(source)}:BURS:STAT?')
         return bool(int(response))
 
     def trigger(self, source: int = 1) -> None:
-        self.instrument.write(f'TRIG{int(source)}')
+        self._enqueue(None, f'TRIG{int(source)}')
 
     def get_trigger_count(self, source: int = 1):
-        response = self.instrument.query(f'TRIG{source}:COUN?')
+        response = self.query_raw_scpi(f'TRIG{source}:COUN?')
         return int(float(response))
 
     def set_trigger_delay(self, delay, source: int = 1):
         str_options = ['MIN', 'MAX']
         if isinstance(delay, (float, int)):
-            self.instrument.write(f'TRIG{source}:DEL {delay}')
+            self._set('trigger_delay', delay, source)
         elif isinstance(delay, str) and (delay.upper() in str_options):
-            self.instrument.write(f'TRIG{source}:DEL {delay.upper()}')
+            self._set('trigger_delay', delay.upper(), source)
         else:
             raise ValueError('invalid entry for delay')
         return None
 
     def get_trigger_delay(self, source: int = 1):
-        response = self.instrument.query(f'TRIG{source}:DEL?')
-        return float(response)
+        return self._get('trigger_delay', source)
 
     def set_trigger_source(self, trig_source, source: int = 1):
         trig_opts = ['IMM', 'IMMEDIATE', 'EXT', 'EXTERNAL',
                      'TIM', 'TIMER', 'BUS']
         trig_source = trig_source.upper()
         if trig_source in trig_opts:
-            self.instrument.write(f'TRIG{source}:SOUR {trig_source}')
+            self._set('trigger_source', trig_source, source)
         else:
             raise ValueError(f'Invalid arg for trig_source ({trig_opts})')
         return None
 
     def get_trigger_source(self, source: int = 1):
-        response = self.instrument.query(f'TRIG{source}:SOUR?')
-        return response.strip().lower()
+        return self._get('trigger_source', source)
 
     @property
     def angle_unit(self):
-        return self.instrument.query('UNIT:ANGL?').strip().lower()
+        return self.query_raw_scpi('UNIT:ANGL?').lower()
 
     def set_voltage_display_mode(self, mode: str):
         mode = mode.upper()
         if mode in ['AMPL', 'HIGH', 'AMPLITUDEOFF', 'HIGHLOW']:
-            self.instrument.write(f'DISP:UNIT:VOLT {mode}')
+            self._enqueue('DISP:UNIT:VOLT', f'DISP:UNIT:VOLT {mode}')
         else:
             raise ValueError('Invalid value for arg "mode"')
         return None
 
     @property
     def voltage_display_mode(self):
-        response = self.instrument.query('DISP:UNIT:VOLT?')
-        return response.strip().lower()
+        response = self.query_raw_scpi('DISP:UNIT:VOLT?')
+        return response.lower()
 
     def set_pulse_duration_display_mode(self, mode: str):
         mode = mode.upper()
         if mode in ['WIDT', 'WIDTH', 'DUTY']:
-            self.instrument.write(f'DISP:UNIT:PULS {mode}')
+            self._enqueue('DISP:UNIT:PULS', f'DISP:UNIT:PULS {mode}')
         else:
             raise ValueError('Invalid value for arg "mode"')
         return None
 
     @property
     def pulse_duration_display_mode(self):
-        response = self.instrument.query('DISP:UNIT:PULS?')
-        return response.strip().lower()
+        response = self.query_raw_scpi('DISP:UNIT:PULS?')
+        return response.lower()
 
     def set_horizontal_display_mode(self, mode: str):
         mode = mode.upper()
         if mode in ['FREQ', 'FREQUENCY', 'PER', 'PERIOD']:
-            self.instrument.write(f'DISP:UNIT:RATE {mode}')
+            self._enqueue('DISP:UNIT:RATE', f'DISP:UNIT:RATE {mode}')
         else:
             raise ValueError('Invalid value for arg "mode"')
         return None
 
     @property
     def horizontal_display_mode(self):
-        response = self.instrument.query('DISP:UNIT:RATE?')
-        return response.strip().lower()
+        response = self.query_raw_scpi('DISP:UNIT:RATE?')
+        return response.lower()
 
     def set_output_state(self, state: bool, source: int = 1) -> None:
-        self.instrument.write(f"OUTP{int(source)} {1 if state else 0}")
+        header = f'OUTP{int(source)}'
+        self._enqueue(header, f'{header} {1 if state else 0}')
 
     def get_output_state(self, source: int = 1) -> bool:
-        response = self.instrument.query(f"OUTP{int(source)}?")
+        response = self.query_raw_scpi(f"OUTP{int(source)}?")
         return bool(int(response))
 
     def set_output_impedance(self, impedance, source=1):
         """Valid options are 1-10k, min, max, and inf"""
-        self.instrument.write(f'OUTP{source}:LOAD {impedance}')
+        self._set('output_impedance', impedance, source)
         return None
 
     def get_output_impedance(self, source=1):
-        response = self.instrument.query(f'OUTP{source}:LOAD?')
-        return float(response)
+        return self._get('output_impedance', source)
 
     def set_display_text(self, text: str):
-        self.instrument.write(f'DISP:TEXT "{text}"')
+        self._enqueue('DISP:TEXT', f'DISP:TEXT "{text}"')
         return None
 
     def get_display_text(self):
-        response = self.instrument.query('DISP:TEXT?')
-        text = response.strip().replace('"', '')
+        response = self.query_raw_scpi('DISP:TEXT?')
+        text = response.replace('"', '')
         return text
 
     def clear_display_text(self):
@@ -366,9 +418,9 @@ class Keysight_33500B(Scpi_Instrument):
 
         # send data
         cmd_str = "SOUR:DATA:ARB1:DAC"
-        self.instrument.write('{} {},{}'.format(cmd_str,
-                                                arb_name,
-                                                ",".join(map(str, data))))
+        self._enqueue(None, '{} {},{}'.format(cmd_str,
+                                              arb_name,
+                                              ",".join(map(str, data))))
 
 
 if __name__ == "__main__":
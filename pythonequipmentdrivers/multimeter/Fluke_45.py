@@ -1,5 +1,5 @@
-from pythonequipmentdrivers import Scpi_Instrument
-from pythonequipmentdrivers import VisaIOError
+from ..core import Scpi_Instrument
+from ..core import VisaIOError
 
 
 class Fluke_45(Scpi_Instrument):
@@ -1,4 +1,4 @@
-from pythonequipmentdrivers import Scpi_Instrument
+from ..core import Scpi_Instrument
 import numpy as np
 from typing import Union, Tuple
 from pathlib import Path
@@ -451,7 +451,8 @@ class Lecroy_WR8xxx(Scpi_Instrument):
                 currently being used for triggering.
         """
 
-        source = kwargs.get('source', self.get_trigger_source())
+        source = (kwargs['source'] if 'source' in kwargs
+                  else self.get_trigger_source())
         self.instrument.write(f'C{int(source)}:TRLV {float(level)}\n')
 
     def get_trigger_level(self, **kwargs) -> float:
@@ -471,7 +472,8 @@ class Lecroy_WR8xxx(Scpi_Instrument):
                 the signal being triggered on
         """
 
-        source = kwargs.get('source', self.get_trigger_source())
+        source = (kwargs['source'] if 'source' in kwargs
+                  else self.get_trigger_source())
 
         read_cmd = f'C{int(source)}:TRLV'
         response = self.instrument.query(f'{read_cmd}?')
@@ -506,7 +508,8 @@ class Lecroy_WR8xxx(Scpi_Instrument):
         valid_options = {'POS': 'POS', 'RISE': 'POS',
                          'NEG': 'NEG', 'FALL': 'NEG'}
 
-        source = kwargs.get('source', self.get_trigger_source())
+        source = (kwargs['source'] if 'source' in kwargs
+                  else self.get_trigger_source())
 
         slope = str(slope).upper()
         if slope not in valid_options.keys():
@@ -531,7 +534,8 @@ class Lecroy_WR8xxx(Scpi_Instrument):
             str: trigger edge polarity
         """
 
-        source = kwargs.get('source', self.get_trigger_source())
+        source = (kwargs['source'] if 'source' in kwargs
+                  else self.get_trigger_source())
 
         response = self.instrument.query(f'C{source}:TRSL?')
         return response.split()[-1].lower()
@@ -1,4 +1,4 @@
-from pythonequipmentdrivers import Scpi_Instrument
+from ..core import Scpi_Instrument
 import struct
 import numpy as np
 from time import sleep
@@ -1,4 +1,4 @@
-from pythonequipmentdrivers import Scpi_Instrument
+from ..core import Scpi_Instrument
 
 
 class Yokogawa_760203(Scpi_Instrument):  # 3 phase
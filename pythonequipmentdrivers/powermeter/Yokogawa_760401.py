@@ -1,4 +1,4 @@
-from pythonequipmentdrivers import Scpi_Instrument
+from ..core import Scpi_Instrument
 
 
 class Yokogawa_760401(Scpi_Instrument):  # single phase
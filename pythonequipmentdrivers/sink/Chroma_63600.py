@@ -1,5 +1,5 @@
 from typing import Tuple, Union
-from pythonequipmentdrivers import Scpi_Instrument
+from ..core import Scpi_Instrument
 import numpy as np
 from time import sleep
 
@@ -936,8 +936,7 @@ class Chroma_63600(Scpi_Instrument):
         returns: list of floats or float
         """
 
-        response = self.instrument.query('MEAS:ALLV?')
-        voltages = list(map(float, response.split(',')))
+        voltages = self.instrument.query_ascii_values('MEAS:ALLV?')
 
         if return_average:
             return np.mean(voltages)
@@ -956,8 +955,7 @@ class Chroma_63600(Scpi_Instrument):
         returns: list of floats or float
         """
 
-        response = self.instrument.query('MEAS:ALLC?')
-        currents = list(map(float, response.split(',')))
+        currents = self.instrument.query_ascii_values('MEAS:ALLC?')
 
         if return_sum:
             return sum(currents)
@@ -976,8 +974,7 @@ class Chroma_63600(Scpi_Instrument):
         returns: list of floats or float
         """
 
-        response = self.instrument.query('MEAS:ALLP?')
-        powers = list(map(float, response.split(',')))
+        powers = self.instrument.query_ascii_values('MEAS:ALLP?')
 
         if return_sum:
             return sum(powers)
@@ -1,5 +1,5 @@
 from typing import Union
-from pythonequipmentdrivers import Scpi_Instrument
+from ..core import Scpi_Instrument
 import numpy as np
 from time import sleep
 
@@ -1,5 +1,5 @@
 from typing import Union
-from pythonequipmentdrivers import Scpi_Instrument
+from ..core import Scpi_Instrument
 
 
 class CaliforniaInstruments_CSW5550(Scpi_Instrument):
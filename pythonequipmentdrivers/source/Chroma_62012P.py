@@ -1,4 +1,4 @@
-from pythonequipmentdrivers import Scpi_Instrument
+from ..core import Scpi_Instrument
 from time import sleep
 import numpy as np
 from typing import Tuple, Dict, List, Union
@@ -1,5 +1,5 @@
 from typing import Union
-from pythonequipmentdrivers import Scpi_Instrument
+from ..core import Scpi_Instrument
 from time import sleep
 import numpy as np
 
@@ -1,6 +1,6 @@
 import logging
 from time import time
-from pythonequipmentdrivers import Scpi_Instrument
+from ..core import Scpi_Instrument
 
 logger = logging.getLogger(__name__)
 
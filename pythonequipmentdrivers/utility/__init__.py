@@ -1,5 +1,6 @@
-from .data_management import (log_data, dump_data, create_test_log,
-                              dump_array_data)
+from .data_management import (log_data, log_rows, close_log, MemoryLogger,
+                              dump_data, create_test_log, dump_array_data)
 
 
-__all__ = ['log_data', 'dump_data', 'create_test_log', 'dump_array_data']
+__all__ = ['log_data', 'log_rows', 'close_log', 'MemoryLogger', 'dump_data',
+           'create_test_log', 'dump_array_data']
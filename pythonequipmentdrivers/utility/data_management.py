@@ -1,13 +1,102 @@
 from pathlib import Path
-from time import strftime
+from functools import lru_cache
+import io
+import os
+from datetime import datetime
 import json
-from itertools import zip_longest
-from typing import Iterable, Optional
+from itertools import count, zip_longest
+from collections import OrderedDict
+from typing import (IO, Callable, Iterable, Iterator, List, Optional,
+                    Tuple)
+import numpy as np
+import atexit
 
 
-def log_data(file_path: Path, *data, init=False):
+# log files held open by log_data, keyed by resolved path. ordered from least
+# to most recently used, the least recently used file is closed once more than
+# _MAX_OPEN_LOGS are open
+_open_logs: 'OrderedDict[str, IO]' = OrderedDict()
+_MAX_OPEN_LOGS = 32
+
+
+@lru_cache(maxsize=256)
+def _resolve_csv(path_str: str, cwd: str) -> str:
+    """
+    _resolve_csv(path_str, cwd)
+
+    Returns the absolute path of the csv file for 'path_str' (see _with_csv).
+    Results are cached as loggers typically resolve the same path for every
+    row, 'cwd' is part of the cache key so that relative paths are resolved
+    correctly if it changes.
+    """
+
+    return str(_with_csv(Path(cwd, path_str)).resolve())
+
+
+def _with_csv(file_path: Path) -> Path:
+    """
+    _with_csv(file_path)
+
+    Returns 'file_path' with the .csv extension appended to the file name,
+    unless it already has it.
+    """
+
+    if file_path.suffix.lower() == '.csv':
+        return file_path
+    return file_path.with_suffix(f'{file_path.suffix}.csv')
+
+
+@lru_cache(maxsize=None)
+def _row_format(n_columns: int) -> Callable[..., str]:
+    """
+    _row_format(n_columns)
+
+    Returns a function that formats 'n_columns' values as a comma separated
+    line. Formatters are cached per row length, as rows logged to the same
+    file typically share a length. Each value is converted with str() so the
+    output is the same as joining the values directly.
+    """
+
+    return (','.join(['{!s}']*n_columns) + '\n').format
+
+
+def _format_rows(rows: Iterable[Iterable]) -> Iterator[str]:
+    """
+    _format_rows(rows)
+
+    Yields each row of 'rows' as a comma separated line, see _row_format.
     """
-    log_data(file_path, *data, init=False)
+
+    for row in rows:
+        try:
+            n_columns = len(row)
+        except TypeError:  # unsized iterable
+            row = tuple(row)
+            n_columns = len(row)
+        yield _row_format(n_columns)(*row)
+
+
+def _write_rows(f: IO, rows: Iterable[Iterable], binary: bool) -> None:
+    """
+    _write_rows(f, rows, binary)
+
+    Writes 'rows' to the open file 'f' as comma separated lines. If 'binary'
+    is True 'f' is expected to be opened in binary mode and each line is
+    encoded as ascii, bypassing the text encoding layer.
+    """
+
+    lines = _format_rows(rows)
+    if binary:
+        f.writelines(line.encode('ascii') for line in lines)
+    else:
+        f.writelines(lines)
+
+
+def log_data(file_path: Path, *data, init=False,
+             buffering: int = io.DEFAULT_BUFFER_SIZE*16, binary: bool = False):
+    """
+    log_data(file_path, *data, init=False, buffering=io.DEFAULT_BUFFER_SIZE*16,
+             binary=False)
 
     Writes an iterable to a row of a csv file. Useful for logging data row by
     row while a test or measurement is in progress.
@@ -21,7 +110,7 @@ def log_data(file_path: Path, *data, init=False):
     The arguement "file_path" specifies the path of the file to be
     created/updated. The log file will be storted at file_path.csv
     , file_path itself does not need to contain the file extension, it will
-    automatically be added.
+    automatically be added if not already present.
 
     The iterable "data" can contain an arbitrary number of elements and each
     element can use an arbitrary data type as long as it can be safely cast to
@@ -47,10 +136,23 @@ def log_data(file_path: Path, *data, init=False):
             not need to include the file extension or previously exist.
         data: a sequence or unpacked iterable of data to be stored.
 
+    The log file is kept open between calls so that each row does not need
+    to re-open the file, the rows are flushed to the file at the end of each
+    call. Use close_log to close the file once logging is complete (open log
+    files are also closed automatically when the interpreter exits, or when
+    many other log files have been opened since it was last used).
+
     Kwargs:
         init (bool, optional): Whether or not to open the log file in write
             mode ("True", for creating a new file) or append mode ("False" for
             adding additional data). Defaults to False.
+        buffering (int, optional): size of the write buffer in bytes used
+            when writing to the log file. Defaults to
+            io.DEFAULT_BUFFER_SIZE*16.
+        binary (bool, optional): If True the log file is written in binary
+            mode with each row encoded as ascii, which avoids the overhead of
+            text encoding. All data must be ascii when enabled. Defaults to
+            False.
     Example:
         cwd = Path().parent.resolve()
         file = cwd.joinpath('my_data')
@@ -60,18 +162,205 @@ def log_data(file_path: Path, *data, init=False):
         log_data(file, 1, 2, 3)
         log_data(file, *mydata)  # note use of generator
         log_data(file, *moredata)  # note use of generator
+        close_log(file)
     """
 
-    mode = 'w' if init else 'a'
-    file_path = Path(file_path)
-    file_path_ext = file_path.parent / f'{file_path.name}.csv'
-    with open(file_path_ext, mode) as f:
-        print(*data, sep=',', file=f)
+    log_rows(file_path, (data,), init=init, buffering=buffering,
+             binary=binary)
 
 
-def dump_data(directory, file_name, data):
+def log_rows(file_path: Path, rows: Iterable[Iterable], init: bool = False,
+             buffering: int = io.DEFAULT_BUFFER_SIZE*16,
+             binary: bool = False) -> None:
+    """
+    log_rows(file_path, rows, init=False, buffering=io.DEFAULT_BUFFER_SIZE*16,
+             binary=False)
+
+    Writes multiple rows to a csv file in one call. Behaves the same as
+    calling log_data once per row, but is more efficient when rows are
+    collected in batches. Uses the same open log file as log_data.
+
+    Args:
+        file_path (str, or path-like object): path of the log file to use, does
+            not need to include the file extension or previously exist.
+        rows (Iterable[Iterable]): rows of data to be stored, each row is an
+            iterable of elements that can be safely cast to a string.
+
+    Kwargs:
+        init (bool, optional): Whether or not to open the log file in write
+            mode ("True", for creating a new file) or append mode ("False" for
+            adding additional data). Defaults to False.
+        buffering (int, optional): size of the write buffer in bytes used
+            when writing to the log file. Defaults to
+            io.DEFAULT_BUFFER_SIZE*16.
+        binary (bool, optional): If True the log file is written in binary
+            mode with each row encoded as ascii, which avoids the overhead of
+            text encoding. All data must be ascii when enabled. Defaults to
+            False.
+    Example:
+        file = Path().parent.resolve().joinpath('my_data')
+        log_rows(file, [("column A", "column B"), (1, 2), (3, 4)], init=True)
+        close_log(file)
     """
-    dump_data(directory, file_name, data)
+
+    file_path_ext = _resolve_csv(str(file_path), os.getcwd())
+
+    suffix = 'b' if binary else ''
+
+    if init:
+        # rows are written to a temporary file that then replaces the log
+        # file, so a failure part way through doesn't leave it truncated
+        close_log(file_path)
+        temp_path = f'{file_path_ext}.tmp'
+        try:
+            with open(temp_path, f'w{suffix}', buffering=buffering) as f:
+                _write_rows(f, rows, binary)
+            os.replace(temp_path, file_path_ext)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        _cache_log(file_path_ext, open(file_path_ext, f'a{suffix}',
+                                       buffering=buffering))
+        return None
+
+    f = _open_logs.get(file_path_ext)
+    if (f is None) or (('b' in f.mode) != binary):
+        close_log(file_path)
+        f = open(file_path_ext, f'a{suffix}', buffering=buffering)
+        _cache_log(file_path_ext, f)
+    else:
+        _open_logs.move_to_end(file_path_ext)
+
+    _write_rows(f, rows, binary)
+    f.flush()  # rows are visible to readers (and other writers) right away
+
+
+def _cache_log(file_path_ext: str, f: IO) -> None:
+    """
+    _cache_log(file_path_ext, f)
+
+    Holds the log file 'f' open for later calls to log_data/log_rows, closing
+    the least recently used log file if too many are open.
+    """
+
+    _open_logs[file_path_ext] = f
+    while len(_open_logs) > _MAX_OPEN_LOGS:
+        _, oldest = _open_logs.popitem(last=False)
+        oldest.close()
+
+
+def close_log(file_path: Path) -> None:
+    """
+    close_log(file_path)
+
+    Flushes and closes the log file used by log_data/log_rows for "file_path"
+    if it is open. The file will be re-opened the next time it is logged to.
+
+    Args:
+        file_path (str, or path-like object): path of the log file, as passed
+            to log_data/log_rows.
+    """
+
+    file_path_ext = _resolve_csv(str(file_path), os.getcwd())
+
+    f = _open_logs.pop(file_path_ext, None)
+    if f is not None:
+        f.close()
+
+
+@atexit.register
+def _close_all_logs() -> None:
+    for f in _open_logs.values():
+        f.close()
+    _open_logs.clear()
+
+
+class MemoryLogger:
+    """
+    MemoryLogger(file_path, header=None)
+
+    Logs rows of data to a csv file, like log_data, but holds the rows in
+    memory until the logger is flushed or closed. This keeps file I/O out of
+    fast measurement loops, at the cost of holding the data in RAM.
+
+    The log file will be stored at file_path.csv (the extension is added if
+    not already present). The first write creates (or overwrites) the file,
+    any later flushes append to it.
+
+    Args:
+        file_path (str, or path-like object): path of the log file to use, does
+            not need to include the file extension or previously exist.
+        header (Iterable, optional): column names written as the first row of
+            the log file. Defaults to None.
+
+    Example:
+        with MemoryLogger('my_data', header=('time', 'voltage')) as logger:
+            for t in range(1000):
+                logger.log(t, dmm.measure_voltage())
+    """
+
+    def __init__(self, file_path: Path,
+                 header: Optional[Iterable] = None) -> None:
+        self.file_path = file_path
+        self._rows: List[str] = []
+        self._init = True
+
+        if header is not None:
+            self.log(*header)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def log(self, *data) -> None:
+        """
+        log(*data)
+
+        Adds a row to the log, see log_data for the format of "data".
+
+        Args:
+            data: a sequence or unpacked iterable of data to be stored.
+        """
+
+        self._rows.append(_row_format(len(data))(*data))
+
+    def flush(self) -> None:
+        """
+        flush()
+
+        Writes any rows held in memory to the log file.
+        """
+
+        if not (self._rows or self._init):
+            return None
+
+        file_path_ext = _resolve_csv(str(self.file_path), os.getcwd())
+        close_log(self.file_path)  # write after rows from log_data
+        with open(file_path_ext, 'w' if self._init else 'a',
+                  buffering=1 << 20) as f:
+            f.writelines(self._rows)
+
+        self._rows.clear()
+        self._init = False
+
+    def close(self) -> None:
+        """
+        close()
+
+        Writes any rows held in memory to the log file. Called automatically
+        when used as a context manager.
+        """
+
+        self.flush()
+
+
+def dump_data(directory, file_name, data, binary=False):
+    """
+    dump_data(directory, file_name, data, binary=False)
 
     Writes an iterable of iterables, such as a list of lists, row by row to a
     csv file. Useful for logging a large chunk of data at once after test or
@@ -80,7 +369,7 @@ def dump_data(directory, file_name, data):
     The arguements "directory" and "file_name" specify the path of the file to
     be created. The log file will be storted at directory/file_name.csv,
     file_name itself does not need to contain the file extension, it will
-    automatically be added.
+    automatically be added if not already present.
 
     The iterable "data" can contain an arbitrary number of elements which in
     turn can have arbitrary length and data type as long as it can be safely
@@ -99,14 +388,19 @@ def dump_data(directory, file_name, data):
             the file extension.
         data: an iterable of iterables of data to be stored.
 
+    Kwargs:
+        binary (bool, optional): If True the file is written in binary mode
+            with each row encoded as ascii, which avoids the overhead of text
+            encoding. All data must be ascii when enabled. Defaults to False.
+
     Returns:
         NoneType
     """
 
-    with open(Path(directory) / f'{file_name}.csv', 'w') as f:
-
-        for item in data:
-            print(*item, sep=',', file=f)
+    file_path_ext = _resolve_csv(str(Path(directory) / file_name), os.getcwd())
+    close_log(Path(directory) / file_name)  # write after rows from log_data
+    with open(file_path_ext, 'wb' if binary else 'w', buffering=1 << 20) as f:
+        _write_rows(f, data, binary)
 
     return None
 
@@ -114,10 +408,11 @@ def dump_data(directory, file_name, data):
 def dump_array_data(file_path: Path,
                     data: Iterable[Iterable[any]],
                     init: bool = False,
-                    fill_value: Optional[str] = None) -> None:
+                    fill_value: Optional[str] = None,
+                    binary: bool = False) -> None:
     """
     dump_array_data(file_path, data, init=False, longest=False,
-    fill_value=None)
+    fill_value=None, binary=False)
 
     Writes a iterable of iterables to rows of a csv file by transposing them.
     Useful for logging data contained in multiple arrays, row by row after
@@ -136,7 +431,7 @@ def dump_array_data(file_path: Path,
     The arguement "file_path" specifies the path of the file to be
     created/updated. The log file will be storted at file_path.csv
     , file_path itself does not need to contain the file extension, it will
-    automatically be added.
+    automatically be added if not already present.
 
     The iterable "data" can contain an arbitrary number of elements and each
     element can use an arbitrary data type as long as it can be safely cast to
@@ -164,6 +459,9 @@ def dump_array_data(file_path: Path,
         init (bool, optional): Whether or not to open the log file in write
             mode ("True", for creating a new file) or append mode ("False" for
             adding additional data). Defaults to False.
+        binary (bool, optional): If True the file is written in binary mode
+            with each row encoded as ascii, which avoids the overhead of text
+            encoding. All data must be ascii when enabled. Defaults to False.
     Example:
         cwd = Path().parent.resolve()
         file = cwd.joinpath('my_data')
@@ -185,16 +483,81 @@ def dump_array_data(file_path: Path,
 
     """
 
-    file_path = Path(file_path)
-    file_path_ext = file_path.parent / f'{file_path.stem}.csv'
+    file_path_ext = _resolve_csv(str(file_path), os.getcwd())
+    close_log(file_path)  # write after rows from log_data
+
+    data = tuple(data)
+    numeric_columns = _as_numeric_columns(data)
+
+    mode = ('w' if init else 'a') + ('b' if binary else '')
+    with open(file_path_ext, mode, buffering=1 << 20) as f:
+
+        if numeric_columns is not None:
+            rows = _stack_columns(numeric_columns, fill_value)
+        elif fill_value is not None:  # create generator
+            rows = zip_longest(*data, fillvalue=fill_value)
+        else:
+            rows = zip(*data)
+
+        _write_rows(f, rows, binary)
+
+
+def _as_numeric_columns(data: Tuple) -> Optional[List[np.ndarray]]:
+    """
+    _as_numeric_columns(data)
+
+    Returns the columns of 'data' if every column is a numpy array of numbers
+    (int, uint, or float) of the same dtype, columns are required to share a
+    dtype so that values are not cast (e.g. int -> float) when written.
+    Otherwise returns None. Lists are not converted as numpy would promote
+    mixed int/float values, changing how they are written.
+    """
+
+    if not data:
+        return None
+
+    for column in data:
+        if not isinstance(column, np.ndarray):
+            return None
+        if (column.ndim != 1) or (column.dtype.kind not in 'iuf'):
+            return None
+
+    if len({column.dtype for column in data}) != 1:
+        return None
+    return list(data)
+
+
+def _stack_columns(columns: List[np.ndarray],
+                   fill_value: Optional[str] = None) -> List[list]:
+    """
+    _stack_columns(columns, fill_value=None)
+
+    Returns the rows formed by the numeric arrays 'columns', built as a single
+    2D array and converted to rows in one pass. Matches the output of zip
+    (fill_value is None, rows truncated to the shortest column) or
+    zip_longest (shorter columns padded with fill_value).
+    """
+
+    if fill_value is None:
+        n_rows = min(len(column) for column in columns)
+        array = np.column_stack([column[:n_rows] for column in columns])
 
-    if fill_value is not None:  # create generator
-        rows = zip_longest(*data, fillvalue=fill_value)
     else:
-        rows = zip(*data)
+        dtype = columns[0].dtype
+        if np.asarray(fill_value).dtype != dtype:
+            # mixed contents, values are kept as is rather than being cast
+            dtype = object
+            if columns[0].dtype.itemsize < 8:
+                columns = [column.astype(str) for column in columns]
+
+        n_rows = max(len(column) for column in columns)
+        array = np.full((n_rows, len(columns)), fill_value, dtype=dtype)
+        for i, column in enumerate(columns):
+            array[:len(column), i] = column
 
-    with open(file_path_ext, 'w' if init else 'a') as f:
-        print(*rows, sep=',', end='\n', file=f)
+    if (array.dtype != object) and (array.dtype.itemsize < 8):
+        array = array.astype(str)  # python types would add precision
+    return array.tolist()
 
 
 def create_test_log(base_dir, images=False, raw_data=False, **test_info):
@@ -210,7 +573,9 @@ def create_test_log(base_dir, images=False, raw_data=False, **test_info):
     the directory was created in the format YYYYMMDDHHmmSS. To change the name
     of the directory structure pass an alternate name using the arguement
     "test_name". The timestamp is not optional and will always be added, this
-    is included to prevent the accidently overwrite of data.
+    is included to prevent the accidently overwrite of data. If a directory
+    with the same name already exists (multiple logs created within the same
+    second) a counter is appended, i.e. "test_data_TIMESTAMP_1".
 
     Two additional sub-directories can be created within the directory
     structure by setting their boolean arguements "images" and "raw_data" to
@@ -264,12 +629,20 @@ def create_test_log(base_dir, images=False, raw_data=False, **test_info):
     """
 
     test_name = test_info.get('test_name', 'test_data')
-    file_t_stamp = strftime(r"%Y%m%d%H%M%S")
-    test_info['run_time'] = strftime(r"%Y/%m/%d %H:%M:%S")
+    now = datetime.now()  # single timestamp so both formats are consistent
+    file_t_stamp = now.strftime(r"%Y%m%d%H%M%S")
+    test_info['run_time'] = now.strftime(r"%Y/%m/%d %H:%M:%S")
 
     # make base directory for test log
+    # arg prevents accidently overwriting, if a log was already created with
+    # the same timestamp a counter is added to the directory name instead
     test_dir = Path(base_dir) / f'{test_name}_{file_t_stamp}'
-    test_dir.mkdir(exist_ok=False)  # arg prevents accidently overwriting
+    for counter in count(1):
+        try:
+            test_dir.mkdir(exist_ok=False)
+            break
+        except FileExistsError:
+            test_dir = Path(base_dir) / f'{test_name}_{file_t_stamp}_{counter}'
 
     # optional sub-directories for images or raw data files
     if images:
@@ -279,11 +652,11 @@ def create_test_log(base_dir, images=False, raw_data=False, **test_info):
 
     # dump config dictionary to file if kwargs were passed
     if test_info:
-        with open(test_dir / f'log_{file_t_stamp}.txt', 'w') as f:
-            json.dump(test_info, f, indent=4,
-                      check_circular=True,
-                      allow_nan=True,
-                      sort_keys=False)
+        # test_info is plain configuration data (not self-referential), skip
+        # the circular reference check
+        with open(test_dir / f'log_{file_t_stamp}.json', 'w',
+                  buffering=1 << 16) as f:
+            json.dump(test_info, f, indent=4, check_circular=False)
 
     return test_dir  # return newly created directory
 